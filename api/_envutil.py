@@ -0,0 +1,43 @@
+"""
+Shared .env loader for local runs (KEY=value / KEY="value" lines only).
+
+Replaces the per-module copies of _load_env_file: the whole file is parsed
+with one precompiled regex instead of per-line string surgery. Values never
+override variables already present in the environment, so it is safe to call
+anywhere (Vercel provides real env vars).
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+ENV_PATH = BASE_DIR / ".env"
+
+# Whitespace around '=' must stay horizontal ([^\S\n]) — a plain \s would
+# cross the newline on empty-value lines and swallow the next assignment.
+_ENV_RE = re.compile(
+    r"""^[^\S\n]*([A-Za-z_][A-Za-z0-9_]*)[^\S\n]*=[^\S\n]*(?:"([^"]*)"|'([^']*)'|([^\n]*?))[^\S\n]*$""",
+    re.MULTILINE,
+)
+
+
+_LOADED = False
+
+
+def load_env_file() -> None:
+    """Load .env once per process; later calls are free (warm containers)."""
+    global _LOADED
+    if _LOADED:
+        return
+    _LOADED = True
+
+    if not ENV_PATH.exists():
+        return
+
+    content = ENV_PATH.read_text(encoding="utf-8")
+    setdefault = os.environ.setdefault
+    for m in _ENV_RE.finditer(content):
+        setdefault(m.group(1), m.group(2) or m.group(3) or m.group(4) or "")
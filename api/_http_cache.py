@@ -0,0 +1,113 @@
+"""
+Conditional-GET helper for sitemap/RSS fetches.
+
+Remembers ETag / Last-Modified per URL plus the last response body on disk,
+so an unchanged feed is answered with a 304 and the cached bytes instead of
+a full re-download. Persisting is best-effort and silently skipped on
+read-only filesystems (e.g., serverless).
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+CACHE_META_PATH = BASE_DIR / ".http_cache.json"
+CACHE_BODY_DIR = BASE_DIR / ".http_cache"
+
+
+def _load_meta() -> Dict[str, Dict[str, str]]:
+    try:
+        data = json.loads(CACHE_META_PATH.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+_META: Dict[str, Dict[str, str]] = _load_meta()
+_META_DIRTY = False
+# conditional_get runs on the checkers' thread pools; the lock keeps
+# concurrent _META updates (and the final snapshot) consistent.
+_META_LOCK = threading.Lock()
+
+
+def _body_path(url: str) -> Path:
+    return CACHE_BODY_DIR / (hashlib.sha1(url.encode("utf-8")).hexdigest() + ".body")
+
+
+def _save_meta() -> None:
+    with _META_LOCK:
+        if not _META_DIRTY:
+            return
+        snapshot = json.dumps(_META, ensure_ascii=False)
+    try:
+        tmp_path = CACHE_META_PATH.with_suffix(".json.tmp")
+        tmp_path.write_text(snapshot, encoding="utf-8")
+        tmp_path.replace(CACHE_META_PATH)
+    except OSError:
+        # Skip persist on read-only filesystems (e.g., serverless)
+        pass
+
+
+atexit.register(_save_meta)
+
+
+def conditional_get(
+    session: requests.Session,
+    url: str,
+    *,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: int = 15,
+) -> bytes:
+    """
+    GET url, sending If-None-Match / If-Modified-Since from the cache.
+
+    On 304 Not Modified the cached body bytes are returned without a body
+    transfer; otherwise the cache is refreshed from the response headers.
+    The metadata file itself is written once, atomically, at exit.
+    """
+    global _META_DIRTY
+
+    with _META_LOCK:
+        entry = dict(_META.get(url, {}))
+    body_path = _body_path(url)
+
+    merged = dict(headers or {})
+    if body_path.exists():
+        if entry.get("etag"):
+            merged["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            merged["If-Modified-Since"] = entry["last_modified"]
+
+    resp = session.get(url, headers=merged, timeout=timeout, stream=True)
+    if resp.status_code == 304:
+        try:
+            return body_path.read_bytes()
+        except OSError:
+            # Cached body vanished; redo an unconditional fetch.
+            resp = session.get(url, headers=headers, timeout=timeout, stream=True)
+
+    resp.raise_for_status()
+    content = resp.content
+
+    etag = resp.headers.get("ETag", "")
+    last_modified = resp.headers.get("Last-Modified", "")
+    if etag or last_modified:
+        try:
+            CACHE_BODY_DIR.mkdir(parents=True, exist_ok=True)
+            body_path.write_bytes(content)
+        except OSError:
+            # Skip persist on read-only filesystems (e.g., serverless)
+            pass
+        else:
+            with _META_LOCK:
+                _META[url] = {"etag": etag, "last_modified": last_modified}
+                _META_DIRTY = True
+    return content
@@ -1,132 +1,185 @@
+import io
 import json
 import re
 import sys
-import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta, timezone
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Set
 
 import requests
+from requests.adapters import HTTPAdapter, Retry
+
+# orjson serializes dicts (incl. datetimes) several times faster than json.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# lxml parses the large sitemap far faster; fall back to stdlib where missing.
+try:
+    from lxml import etree as ET
+
+    _PARSE_ERROR = ET.XMLSyntaxError
+    # lxml's iterparse builds its own parser; options are passed directly.
+    _ITERPARSE_KWARGS = {"huge_tree": False, "recover": True}
+    _USING_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+    _PARSE_ERROR = ET.ParseError
+    _ITERPARSE_KWARGS = {}
+    _USING_LXML = False
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 if str(BASE_DIR) not in sys.path:
     sys.path.append(str(BASE_DIR))
 
+from api._http_cache import conditional_get
 from spreadsheet2json import load_spreadsheet_data
 
 SITEMAP_URL = "https://prtimes.jp/sitemap-news.xml"
 OUTPUT_DIR = Path(__file__).resolve().parent.parent / "output"
 OUTPUT_PATH = OUTPUT_DIR / "a1_check_releace.json"
 
+# Shared session so repeated fetches reuse TCP/TLS connections.
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=50,
+    pool_maxsize=50,
+    max_retries=Retry(total=2, backoff_factor=0.3),
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
+
+_ZERO_OFFSET = timedelta(0)
+
 
-def load_prtimes_ids() -> List[str]:
+def _to_utc(dt: datetime) -> datetime:
+    """Convert to UTC, skipping the tz hop when the offset is already zero."""
+    return dt if dt.utcoffset() == _ZERO_OFFSET else dt.astimezone(timezone.utc)
+
+
+def load_prtimes_ids(sheet_data: Optional[Dict[str, Any]] = None) -> List[str]:
     """Load company_id list from spreadsheet2json output."""
-    # 本番でも毎回スプレッドシートを読み直す
-    data = load_spreadsheet_data(force_refresh=True, persist=False)
-    raw_ids = data.get("prtimes_id", []) if isinstance(data, dict) else []
-    ids: List[str] = []
-    for cid in raw_ids:
-        cid_str = str(cid).strip()
-        if not cid_str:
-            continue
-        ids.append(cid_str.lstrip("0") or "0")
-    return ids
+    if sheet_data is None:
+        # 本番でも毎回スプレッドシートを読み直す
+        sheet_data = load_spreadsheet_data(force_refresh=True, persist=False)
+    raw_ids = sheet_data.get("prtimes_id", []) if isinstance(sheet_data, dict) else []
+    return [cid.lstrip("0") or "0" for cid in (str(c).strip() for c in raw_ids) if cid]
 
 
 def fetch_sitemap() -> bytes:
     """Fetch the news sitemap (contains latest press releases across PR TIMES)."""
-    resp = requests.get(SITEMAP_URL, timeout=15)
-    resp.raise_for_status()
-    return resp.content
+    # Conditional GET: unchanged sitemaps come back as a 304 + cached bytes.
+    return conditional_get(_SESSION, SITEMAP_URL, timeout=15)
 
 
-def parse_sitemap(xml_bytes: bytes) -> List[Dict[str, Any]]:
-    """Parse sitemap XML and return list of releases with company_id."""
-    ns = {
-        "sm": "http://www.sitemaps.org/schemas/sitemap/0.9",
-        "news": "http://www.google.com/schemas/sitemap-news/0.9",
-    }
-    root = ET.fromstring(xml_bytes)
-    releases: List[Dict[str, Any]] = []
-    pattern = re.compile(r"/p/(\d+)\.(\d+)\.html")
-
-    for url_node in root.findall("sm:url", ns):
-        loc_el = url_node.find("sm:loc", ns)
-        news_el = url_node.find("news:news", ns)
-        if loc_el is None or news_el is None:
-            continue
-
-        loc = (loc_el.text or "").strip()
-        m = pattern.search(loc)
-        if not m:
-            continue
-
-        company_id = m.group(2).lstrip("0") or "0"
-        pub_date_el = news_el.find("news:publication_date", ns)
-        title_el = news_el.find("news:title", ns)
-        if pub_date_el is None:
-            continue
-
-        pub_raw = (pub_date_el.text or "").strip()
-        try:
-            published_at = datetime.fromisoformat(pub_raw)
-        except ValueError:
-            continue
-
-        releases.append(
-            {
-                "company_id": company_id,
-                "url": loc,
-                "title": (title_el.text or "").strip() if title_el is not None else "",
-                "published_at": published_at,
-            }
-        )
-    return releases
+_SM_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+_NEWS_NS = "http://www.google.com/schemas/sitemap-news/0.9"
+_SM_URL_TAG = f"{{{_SM_NS}}}url"
+_SM_LOC_TAG = f"{{{_SM_NS}}}loc"
+_NEWS_PUB_DATE_TAG = f"{{{_NEWS_NS}}}news/{{{_NEWS_NS}}}publication_date"
+_NEWS_TITLE_TAG = f"{{{_NEWS_NS}}}news/{{{_NEWS_NS}}}title"
+_SITEMAP_URL_RE = re.compile(r"/p/(\d+)\.(\d+)\.html")
 
 
-def filter_recent_releases(
-    releases: List[Dict[str, Any]],
-    target_ids: List[str],
-    window_hours: int = 1,
+def parse_sitemap(
+    xml_bytes: bytes,
+    target_set: Optional[Set[str]] = None,
+    window_start: Optional[datetime] = None,
+    window_end: Optional[datetime] = None,
 ) -> List[Dict[str, Any]]:
-    """Filter releases to target company IDs in the previous clock window."""
-    target_set = set(target_ids)
-    now = datetime.now(timezone.utc)
-    window_end = now.replace(minute=0, second=0, microsecond=0)
-    window_start = window_end - timedelta(hours=window_hours)
-    filtered: List[Dict[str, Any]] = []
-
-    for r in releases:
-        cid = r["company_id"]
-        pub_dt: datetime = r["published_at"]
-        pub_dt_utc = pub_dt.astimezone(timezone.utc)
+    """
+    Stream-parse sitemap XML and return releases with company_id.
 
-        if cid not in target_set:
-            continue
-        if pub_dt_utc < window_start or pub_dt_utc >= window_end:
-            continue
+    Filters (target companies / publication window) are applied inline during
+    the scan so non-matching <url> entries are dropped without building a full
+    DOM; each processed element is cleared to keep peak memory flat.
+    """
+    releases: List[Dict[str, Any]] = []
+    # Local bindings keep per-element attribute lookups out of the hot loop.
+    search = _SITEMAP_URL_RE.search
+    append = releases.append
+    parse_iso = datetime.fromisoformat
 
-        filtered.append(
-            {
-                "company_id": cid,
-                "url": r["url"],
-                "title": r["title"],
-                "published_at": pub_dt_utc.isoformat(),
-            }
-        )
+    try:
+        for _event, elem in ET.iterparse(
+            io.BytesIO(xml_bytes), events=("end",), **_ITERPARSE_KWARGS
+        ):
+            if elem.tag != _SM_URL_TAG:
+                continue
+
+            try:
+                loc = (elem.findtext(_SM_LOC_TAG) or "").strip()
+                m = search(loc)
+                if not m:
+                    continue
+
+                company_id = m.group(2).lstrip("0") or "0"
+                if target_set is not None and company_id not in target_set:
+                    continue
+
+                pub_raw = (elem.findtext(_NEWS_PUB_DATE_TAG) or "").strip()
+                if not pub_raw:
+                    continue
+                try:
+                    published_at = parse_iso(pub_raw)
+                except ValueError:
+                    continue
+
+                if window_start is not None or window_end is not None:
+                    pub_utc = _to_utc(published_at)
+                    if window_start is not None and pub_utc < window_start:
+                        continue
+                    if window_end is not None and pub_utc >= window_end:
+                        continue
+
+                append(
+                    {
+                        "company_id": company_id,
+                        "url": loc,
+                        "title": (elem.findtext(_NEWS_TITLE_TAG) or "").strip(),
+                        "published_at": published_at,
+                    }
+                )
+            finally:
+                elem.clear()
+                if _USING_LXML:
+                    # lxml keeps processed siblings attached to the root; drop them.
+                    while elem.getprevious() is not None:
+                        del elem.getparent()[0]
+    except _PARSE_ERROR:
+        # iterparse raises lazily mid-iteration; a malformed sitemap yields
+        # an empty result like the other checkers.
+        return []
 
-    filtered.sort(key=lambda x: x["published_at"], reverse=True)
-    return filtered
+    return releases
 
 
-def check_releases(window_hours: int = 1) -> Dict[str, Any]:
+def check_releases(
+    window_hours: int = 1, sheet_data: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """High-level entry: fetch sitemap, filter, and return structured data."""
-    ids = load_prtimes_ids()
-    xml_bytes = fetch_sitemap()
-    releases = parse_sitemap(xml_bytes)
-    recent = filter_recent_releases(releases, ids, window_hours=window_hours)
-
+    ids = load_prtimes_ids(sheet_data)
     now = datetime.now(timezone.utc)
+    window_end = now.replace(minute=0, second=0, microsecond=0)
+    window_start = window_end - timedelta(hours=window_hours)
+
+    xml_bytes = fetch_sitemap()
+    matched = parse_sitemap(xml_bytes, set(ids), window_start, window_end)
+    recent = [
+        {
+            "company_id": r["company_id"],
+            "url": r["url"],
+            "title": r["title"],
+            # Keep the datetime native; ISO-format only when dumping JSON.
+            "published_at": _to_utc(r["published_at"]),
+        }
+        for r in matched
+    ]
+    recent.sort(key=itemgetter("published_at"), reverse=True)
     payload: Dict[str, Any] = {
         "checked_at": now.isoformat(),
         "window_hours": window_hours,
@@ -137,10 +190,22 @@ def check_releases(window_hours: int = 1) -> Dict[str, Any]:
     return payload
 
 
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
 def write_output(data: Dict[str, Any]) -> None:
     try:
         OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-        OUTPUT_PATH.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        if orjson is not None:
+            OUTPUT_PATH.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            OUTPUT_PATH.write_text(
+                json.dumps(data, ensure_ascii=False, indent=2, default=_json_default),
+                encoding="utf-8",
+            )
     except OSError:
         # Skip persist on read-only filesystems (e.g., serverless)
         pass
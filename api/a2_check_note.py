@@ -1,18 +1,39 @@
 import json
 import sys
-import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter, Retry
+
+# orjson serializes dicts (incl. datetimes) several times faster than json.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# lxml parses RSS feeds far faster; fall back to stdlib where missing.
+try:
+    from lxml import etree as ET
+
+    _XML_PARSER = ET.XMLParser(huge_tree=False, recover=True)
+    _PARSE_ERROR = ET.XMLSyntaxError
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+    _XML_PARSER = None
+    _PARSE_ERROR = ET.ParseError
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 if str(BASE_DIR) not in sys.path:
     sys.path.append(str(BASE_DIR))
 
+from api._http_cache import conditional_get
 from spreadsheet2json import load_spreadsheet_data
 
 OUTPUT_DIR = Path(__file__).resolve().parent.parent / "output"
@@ -26,6 +47,24 @@ HTTP_HEADERS = {
     )
 }
 
+# Shared session so repeated fetches reuse TCP/TLS connections.
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=50,
+    pool_maxsize=50,
+    max_retries=Retry(total=2, backoff_factor=0.3),
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
+
+_ZERO_OFFSET = timedelta(0)
+
+
+def _to_utc(dt: datetime) -> datetime:
+    """Convert to UTC, skipping the tz hop when the offset is already zero."""
+    return dt if dt.utcoffset() == _ZERO_OFFSET else dt.astimezone(timezone.utc)
+
 
 def _normalize_note_id(value: str) -> str:
     """Extract note username/slug from URL or raw value."""
@@ -33,6 +72,12 @@ def _normalize_note_id(value: str) -> str:
     if not raw:
         return ""
 
+    # Bare usernames (the common case) skip the urlparse machinery entirely;
+    # anything mentioning note.com takes the URL path so a bare domain still
+    # normalizes to "" and gets skipped.
+    if "/" not in raw and ":" not in raw and "note.com" not in raw:
+        return raw.lstrip("@")
+
     if "note.com" in raw or "://" in raw:
         parsed = urlparse(raw if "://" in raw else f"https://{raw}")
         path = parsed.path.strip("/")
@@ -43,32 +88,37 @@ def _normalize_note_id(value: str) -> str:
     return raw.lstrip("@")
 
 
-def load_note_ids() -> List[str]:
+def load_note_ids(sheet_data: Optional[Dict[str, Any]] = None) -> List[str]:
     """Load note user IDs from spreadsheet2json output."""
-    # 本番でも毎回スプレッドシートを読み直す
-    data = load_spreadsheet_data(force_refresh=True, persist=False)
-    raw_ids = data.get("note_id", []) if isinstance(data, dict) else []
-    ids: List[str] = []
-    for note_id in raw_ids:
-        normalized = _normalize_note_id(str(note_id))
-        if normalized:
-            ids.append(normalized)
-    return ids
+    if sheet_data is None:
+        # 本番でも毎回スプレッドシートを読み直す
+        sheet_data = load_spreadsheet_data(force_refresh=True, persist=False)
+    raw_ids = sheet_data.get("note_id", []) if isinstance(sheet_data, dict) else []
+    return [nid for nid in (_normalize_note_id(str(n)) for n in raw_ids) if nid]
 
 
 def fetch_rss(note_id: str) -> bytes:
     """Fetch RSS feed bytes for a given note user."""
     url = FEED_URL_TEMPLATE.format(note_id=note_id)
-    resp = requests.get(url, headers=HTTP_HEADERS, timeout=15)
-    resp.raise_for_status()
-    return resp.content
-
-
-def parse_rss(xml_bytes: bytes, note_id: str) -> List[Dict[str, Any]]:
-    """Parse RSS XML and return articles for the specified note_id."""
+    # Conditional GET: unchanged feeds come back as a 304 + cached bytes.
+    return conditional_get(_SESSION, url, headers=HTTP_HEADERS, timeout=15)
+
+
+def parse_rss(
+    xml_bytes: bytes,
+    note_id: str,
+    window_start: Optional[datetime] = None,
+    window_end: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Parse RSS XML and return articles for the specified note_id.
+
+    Optional window bounds are applied inline so stale items are dropped
+    during the scan instead of in a second pass.
+    """
     try:
-        root = ET.fromstring(xml_bytes)
-    except ET.ParseError:
+        root = ET.fromstring(xml_bytes, _XML_PARSER)
+    except _PARSE_ERROR:
         return []
 
     channel = root.find("channel")
@@ -91,6 +141,13 @@ def parse_rss(xml_bytes: bytes, note_id: str) -> List[Dict[str, Any]]:
         if pub_dt.tzinfo is None:
             pub_dt = pub_dt.replace(tzinfo=timezone.utc)
 
+        if window_start is not None or window_end is not None:
+            pub_dt = _to_utc(pub_dt)
+            if window_start is not None and pub_dt < window_start:
+                continue
+            if window_end is not None and pub_dt >= window_end:
+                continue
+
         items.append(
             {
                 "note_id": note_id,
@@ -102,46 +159,28 @@ def parse_rss(xml_bytes: bytes, note_id: str) -> List[Dict[str, Any]]:
     return items
 
 
-def filter_recent(articles: List[Dict[str, Any]], window_hours: int = 1) -> List[Dict[str, Any]]:
-    """Return articles published in the previous clock window."""
+def check_notes(
+    window_hours: int = 1, sheet_data: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """High-level entry: fetch RSS feeds, filter recent, and return structured data."""
+    note_ids = load_note_ids(sheet_data)
     now = datetime.now(timezone.utc)
     window_end = now.replace(minute=0, second=0, microsecond=0)
     window_start = window_end - timedelta(hours=window_hours)
-
-    filtered: List[Dict[str, Any]] = []
-    for article in articles:
-        pub_dt: datetime = article["published_at"]
-        pub_dt_utc = pub_dt.astimezone(timezone.utc)
-        if pub_dt_utc < window_start or pub_dt_utc >= window_end:
-            continue
-
-        filtered.append(
-            {
-                "note_id": article["note_id"],
-                "url": article["url"],
-                "title": article["title"],
-                "published_at": pub_dt_utc.isoformat(),
-            }
-        )
-
-    filtered.sort(key=lambda x: x["published_at"], reverse=True)
-    return filtered
-
-
-def check_notes(window_hours: int = 1) -> Dict[str, Any]:
-    """High-level entry: fetch RSS feeds, filter recent, and return structured data."""
-    note_ids = load_note_ids()
-    all_articles: List[Dict[str, Any]] = []
-
-    for note_id in note_ids:
-        try:
-            xml_bytes = fetch_rss(note_id)
-            all_articles.extend(parse_rss(xml_bytes, note_id))
-        except Exception:
-            continue
-
-    recent = filter_recent(all_articles, window_hours=window_hours)
-    now = datetime.now(timezone.utc)
+    recent: List[Dict[str, Any]] = []
+
+    # Feeds are independent, so fetch them concurrently instead of one by one.
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        futures = {executor.submit(fetch_rss, note_id): note_id for note_id in note_ids}
+        for future in as_completed(futures):
+            note_id = futures[future]
+            try:
+                xml_bytes = future.result()
+            except Exception:
+                continue
+            recent.extend(parse_rss(xml_bytes, note_id, window_start, window_end))
+
+    recent.sort(key=itemgetter("published_at"), reverse=True)
     payload: Dict[str, Any] = {
         "checked_at": now.isoformat(),
         "window_hours": window_hours,
@@ -152,10 +191,22 @@ def check_notes(window_hours: int = 1) -> Dict[str, Any]:
     return payload
 
 
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
 def write_output(data: Dict[str, Any]) -> None:
     try:
         OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-        OUTPUT_PATH.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        if orjson is not None:
+            OUTPUT_PATH.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            OUTPUT_PATH.write_text(
+                json.dumps(data, ensure_ascii=False, indent=2, default=_json_default),
+                encoding="utf-8",
+            )
     except OSError:
         # Skip persist on read-only filesystems (e.g., serverless)
         pass
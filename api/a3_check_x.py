@@ -1,17 +1,38 @@
 import json
 import sys
-import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter, Retry
+
+# orjson serializes dicts (incl. datetimes) several times faster than json.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# lxml parses RSS feeds far faster; fall back to stdlib where missing.
+try:
+    from lxml import etree as ET
+
+    _XML_PARSER = ET.XMLParser(huge_tree=False, recover=True)
+    _PARSE_ERROR = ET.XMLSyntaxError
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+    _XML_PARSER = None
+    _PARSE_ERROR = ET.ParseError
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 if str(BASE_DIR) not in sys.path:
     sys.path.append(str(BASE_DIR))
  
+from api._http_cache import conditional_get
 from spreadsheet2json import load_spreadsheet_data
 
 OUTPUT_DIR = Path(__file__).resolve().parent.parent / "output"
@@ -25,33 +46,56 @@ HTTP_HEADERS = {
     )
 }
 
+# Shared session so repeated fetches reuse TCP/TLS connections.
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=50,
+    pool_maxsize=50,
+    max_retries=Retry(total=2, backoff_factor=0.3),
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
+
+_ZERO_OFFSET = timedelta(0)
+
+
+def _to_utc(dt: datetime) -> datetime:
+    """Convert to UTC, skipping the tz hop when the offset is already zero."""
+    return dt if dt.utcoffset() == _ZERO_OFFSET else dt.astimezone(timezone.utc)
 
-def load_x_ids() -> List[str]:
+
+def load_x_ids(sheet_data: Optional[Dict[str, Any]] = None) -> List[str]:
     """Load X(Twitter) user IDs from spreadsheet2json output."""
-    # 本番でも毎回スプレッドシートを読み直す
-    data = load_spreadsheet_data(force_refresh=True, persist=False)
-    raw_ids = data.get("x_id", []) if isinstance(data, dict) else []
-    ids: List[str] = []
-    for x_id in raw_ids:
-        x_str = str(x_id).strip()
-        if x_str:
-            ids.append(x_str)
-    return ids
+    if sheet_data is None:
+        # 本番でも毎回スプレッドシートを読み直す
+        sheet_data = load_spreadsheet_data(force_refresh=True, persist=False)
+    raw_ids = sheet_data.get("x_id", []) if isinstance(sheet_data, dict) else []
+    return [xid for xid in (str(x).strip() for x in raw_ids) if xid]
 
 
 def fetch_rss(x_id: str) -> bytes:
     """Fetch RSS feed bytes for a given X user via Nitter."""
     url = FEED_URL_TEMPLATE.format(x_id=x_id)
-    resp = requests.get(url, headers=HTTP_HEADERS, timeout=15)
-    resp.raise_for_status()
-    return resp.content
-
-
-def parse_rss(xml_bytes: bytes, x_id: str) -> List[Dict[str, Any]]:
-    """Parse RSS XML and return tweets for the specified x_id."""
+    # Conditional GET: unchanged feeds come back as a 304 + cached bytes.
+    return conditional_get(_SESSION, url, headers=HTTP_HEADERS, timeout=15)
+
+
+def parse_rss(
+    xml_bytes: bytes,
+    x_id: str,
+    window_start: Optional[datetime] = None,
+    window_end: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Parse RSS XML and return tweets for the specified x_id.
+
+    Optional window bounds are applied inline so stale items are dropped
+    during the scan instead of in a second pass.
+    """
     try:
-        root = ET.fromstring(xml_bytes)
-    except ET.ParseError:
+        root = ET.fromstring(xml_bytes, _XML_PARSER)
+    except _PARSE_ERROR:
         return []
 
     channel = root.find("channel")
@@ -74,6 +118,13 @@ def parse_rss(xml_bytes: bytes, x_id: str) -> List[Dict[str, Any]]:
         if pub_dt.tzinfo is None:
             pub_dt = pub_dt.replace(tzinfo=timezone.utc)
 
+        if window_start is not None or window_end is not None:
+            pub_dt = _to_utc(pub_dt)
+            if window_start is not None and pub_dt < window_start:
+                continue
+            if window_end is not None and pub_dt >= window_end:
+                continue
+
         tweets.append(
             {
                 "x_id": x_id,
@@ -85,46 +136,28 @@ def parse_rss(xml_bytes: bytes, x_id: str) -> List[Dict[str, Any]]:
     return tweets
 
 
-def filter_recent(tweets: List[Dict[str, Any]], window_hours: int = 1) -> List[Dict[str, Any]]:
-    """Return tweets published in the previous clock window."""
+def check_x(
+    window_hours: int = 1, sheet_data: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """High-level entry: fetch Nitter feeds, filter recent, and return structured data."""
+    x_ids = load_x_ids(sheet_data)
     now = datetime.now(timezone.utc)
     window_end = now.replace(minute=0, second=0, microsecond=0)
     window_start = window_end - timedelta(hours=window_hours)
-
-    filtered: List[Dict[str, Any]] = []
-    for tweet in tweets:
-        pub_dt: datetime = tweet["published_at"]
-        pub_dt_utc = pub_dt.astimezone(timezone.utc)
-        if pub_dt_utc < window_start or pub_dt_utc >= window_end:
-            continue
-
-        filtered.append(
-            {
-                "x_id": tweet["x_id"],
-                "url": tweet["url"],
-                "title": tweet["title"],
-                "published_at": pub_dt_utc.isoformat(),
-            }
-        )
-
-    filtered.sort(key=lambda x: x["published_at"], reverse=True)
-    return filtered
-
-
-def check_x(window_hours: int = 1) -> Dict[str, Any]:
-    """High-level entry: fetch Nitter feeds, filter recent, and return structured data."""
-    x_ids = load_x_ids()
-    all_tweets: List[Dict[str, Any]] = []
-
-    for x_id in x_ids:
-        try:
-            xml_bytes = fetch_rss(x_id)
-            all_tweets.extend(parse_rss(xml_bytes, x_id))
-        except Exception:
-            continue
-
-    recent = filter_recent(all_tweets, window_hours=window_hours)
-    now = datetime.now(timezone.utc)
+    recent: List[Dict[str, Any]] = []
+
+    # Feeds are independent, so fetch them concurrently instead of one by one.
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        futures = {executor.submit(fetch_rss, x_id): x_id for x_id in x_ids}
+        for future in as_completed(futures):
+            x_id = futures[future]
+            try:
+                xml_bytes = future.result()
+            except Exception:
+                continue
+            recent.extend(parse_rss(xml_bytes, x_id, window_start, window_end))
+
+    recent.sort(key=itemgetter("published_at"), reverse=True)
     payload: Dict[str, Any] = {
         "checked_at": now.isoformat(),
         "window_hours": window_hours,
@@ -135,10 +168,22 @@ def check_x(window_hours: int = 1) -> Dict[str, Any]:
     return payload
 
 
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
 def write_output(data: Dict[str, Any]) -> None:
     try:
         OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-        OUTPUT_PATH.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        if orjson is not None:
+            OUTPUT_PATH.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            OUTPUT_PATH.write_text(
+                json.dumps(data, ensure_ascii=False, indent=2, default=_json_default),
+                encoding="utf-8",
+            )
     except OSError:
         # Skip persist on read-only filesystems (e.g., serverless)
         pass
@@ -1,23 +1,36 @@
+import atexit
 import os
 import json
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-import re
+from typing import Any, Dict, List, Optional, Tuple
+from html.parser import HTMLParser
 from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter, Retry
+
+# orjson serializes dicts (incl. datetimes) several times faster than json.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# lxml extracts OG tags in one C-backed parse; fall back to regex where missing.
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 if str(BASE_DIR) not in sys.path:
     sys.path.append(str(BASE_DIR))
 
-import api.a2_check_note as note_checker
-import api.a1_check_releace as pr_checker
-from spreadsheet2json import load_spreadsheet_data
-
-
 def _build_name_index(sheet: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
     """Create lookup tables to resolve names by prtimes_id / note_id / x_id."""
     by_name = sheet.get("by_name") if isinstance(sheet, dict) else {}
@@ -30,43 +43,34 @@ def _build_name_index(sheet: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
     for name, ids in by_name.items():
         if not isinstance(ids, dict):
             continue
-        pr_id = str(ids.get("prtimes_id", "")).strip()
+        # Sheet values are already strings; skip the str() wrap when possible.
+        pr_id = ids.get("prtimes_id", "")
+        pr_id = (pr_id if isinstance(pr_id, str) else str(pr_id)).strip()
         if pr_id:
             pr_by_id[pr_id.lstrip("0") or "0"] = name
 
-        note_id = str(ids.get("note_id", "")).strip()
+        note_id = ids.get("note_id", "")
+        note_id = (note_id if isinstance(note_id, str) else str(note_id)).strip()
         if note_id:
             note_by_id[note_id] = name
 
-        x_id = str(ids.get("x_id", "")).strip()
+        x_id = ids.get("x_id", "")
+        x_id = (x_id if isinstance(x_id, str) else str(x_id)).strip()
         if x_id:
             x_by_id[x_id] = name
 
     return {"pr": pr_by_id, "note": note_by_id, "x": x_by_id}
 
 
-def _load_env_file():
-    """
-    Minimal .env loader for local runs (KEY="value" lines only).
-    Safe to call in any environment.
-    """
-    env_path = Path(__file__).resolve().parent.parent / ".env"
-    if not env_path.exists():
-        return
-
-    with env_path.open(encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            key, val = line.split("=", 1)
-            val = val.strip().strip('"').strip("'")
-            os.environ.setdefault(key, val)
-
+from api._envutil import load_env_file
 
-_load_env_file()
+load_env_file()
 
 SLACK_WEBHOOK_URL = os.environ.get("SLACK_WEBHOOK_URL")
+# Slack rejects messages with more than 50 blocks.
+_SLACK_MAX_BLOCKS = 50
+# Read at most this much of a preview page; OG tags sit in <head>.
+_PREVIEW_BYTE_BUDGET = 64 * 1024
 HTTP_HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -75,6 +79,31 @@ HTTP_HEADERS = {
     )
 }
 
+# Shared session so preview fetches and Slack posts reuse TCP/TLS connections.
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=50,
+    pool_maxsize=50,
+    max_retries=Retry(total=2, backoff_factor=0.3),
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+# Webhook bursts occasionally draw 429/5xx from Slack; retrying the POST at
+# the transport layer keeps the batch (previews already built) intact. The
+# longest-match mount means only hooks.slack.com gets this; OG fetches keep
+# the light retry above, where re-hitting a dead page is wasted time.
+_SESSION.mount(
+    "https://hooks.slack.com/",
+    HTTPAdapter(
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods={"POST"},
+        )
+    ),
+)
+
 
 def send_to_slack(
     text: str,
@@ -93,65 +122,225 @@ def send_to_slack(
     if blocks:
         payload["blocks"] = blocks
 
-    resp = requests.post(SLACK_WEBHOOK_URL, json=payload, timeout=10)
+    if orjson is not None:
+        resp = _SESSION.post(
+            SLACK_WEBHOOK_URL,
+            data=orjson.dumps(payload),
+            headers={"Content-Type": "application/json"},
+            timeout=10,
+        )
+    else:
+        resp = _SESSION.post(SLACK_WEBHOOK_URL, json=payload, timeout=10)
     resp.raise_for_status()
     return resp
 
 
-def _extract_meta(content: str, pattern: str) -> str:
-    """Return first capture from regex pattern (dotall)."""
-    m = re.search(pattern, content, re.IGNORECASE | re.DOTALL)
-    return (m.group(1).strip() if m else "").replace("\n", " ").strip()
+class _OGExtractor(HTMLParser):
+    """
+    Single-pass OG/meta extractor used when lxml is unavailable.
+
+    Collects og:title / og:description / og:image / <title> and stops
+    consuming input once </head> is seen.
+    """
+
+    _PROPS = {"og:title": "og_title", "og:description": "og_desc", "og:image": "og_image"}
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.meta = {"og_title": "", "og_desc": "", "og_image": "", "title_tag": ""}
+        self.done = False
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == "meta":
+            attrs_dict = dict(attrs)
+            key = self._PROPS.get((attrs_dict.get("property") or "").lower())
+            if key and not self.meta[key]:
+                self.meta[key] = attrs_dict.get("content") or ""
+        elif tag == "title":
+            self._in_title = True
+
+    def handle_data(self, data):
+        if self._in_title and not self.done:
+            self.meta["title_tag"] += data
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+        elif tag == "head":
+            self.done = True
+
+
+def _clean_meta(value: str) -> str:
+    return value.replace("\n", " ").strip()
+
+
+def _parse_og_meta(html: "str | bytes") -> Dict[str, str]:
+    """
+    Extract og:title / og:description / og:image / <title> from HTML.
+
+    Uses a single lxml parse when available (bytes input lets libxml2 sniff
+    the declared charset); otherwise falls back to the stdlib extractor above.
+    """
+    if lxml_html is not None:
+        try:
+            tree = lxml_html.fromstring(html)
+        except Exception:
+            tree = None
+        if tree is not None:
+
+            def _meta(prop: str) -> str:
+                values = tree.xpath(f'//meta[@property="{prop}"]/@content')
+                return _clean_meta(values[0]) if values else ""
+
+            title_el = tree.find(".//title")
+            return {
+                "og_title": _meta("og:title"),
+                "og_desc": _meta("og:description"),
+                "og_image": _meta("og:image"),
+                "title_tag": _clean_meta(title_el.text or "") if title_el is not None else "",
+            }
+
+    if isinstance(html, bytes):
+        html = html.decode("utf-8", errors="replace")
+    extractor = _OGExtractor()
+    try:
+        # Feed in chunks so we can stop early once </head> has been parsed.
+        for start in range(0, len(html), 16384):
+            extractor.feed(html[start : start + 16384])
+            if extractor.done:
+                break
+        extractor.close()
+    except Exception:
+        pass
+    return {key: _clean_meta(value) for key, value in extractor.meta.items()}
+
+
+# OG previews rarely change, so cache them by URL: in-memory for the current
+# process and on disk across warm invocations, expiring after 24h.
+_PREVIEW_CACHE_PATH = BASE_DIR / ".preview_cache.json"
+_PREVIEW_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+
+def _load_preview_cache() -> Dict[str, Dict[str, Any]]:
+    try:
+        raw = json.loads(_PREVIEW_CACHE_PATH.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    if not isinstance(raw, dict):
+        return {}
+    now = time.time()
+    return {
+        url: entry
+        for url, entry in raw.items()
+        if isinstance(entry, dict) and now - entry.get("ts", 0) < _PREVIEW_CACHE_TTL_SECONDS
+    }
+
+
+_PREVIEW_CACHE: Dict[str, Dict[str, Any]] = _load_preview_cache()
+_PREVIEW_CACHE_DIRTY = False
+
+
+def _save_preview_cache() -> None:
+    if not _PREVIEW_CACHE_DIRTY:
+        return
+    try:
+        tmp_path = _PREVIEW_CACHE_PATH.with_suffix(".json.tmp")
+        tmp_path.write_text(
+            json.dumps(_PREVIEW_CACHE, ensure_ascii=False), encoding="utf-8"
+        )
+        tmp_path.replace(_PREVIEW_CACHE_PATH)
+    except OSError:
+        # Skip persist on read-only filesystems (e.g., serverless)
+        pass
+
+
+atexit.register(_save_preview_cache)
 
 
 def fetch_preview(url: str) -> Dict[str, str]:
     """
     Fetch page and extract og:title / og:description / title.
-    Best-effort; returns empty strings on failure.
+    Best-effort; returns empty strings on failure. Results are cached by URL.
     """
+    global _PREVIEW_CACHE_DIRTY
+
+    cached = _PREVIEW_CACHE.get(url)
+    if cached is not None and time.time() - cached.get("ts", 0) < _PREVIEW_CACHE_TTL_SECONDS:
+        return dict(cached.get("meta", {}))
+
+    meta = _fetch_preview(url)
+    if meta.get("title") or meta.get("description"):
+        # Don't cache failed fetches so they can be retried next run.
+        _PREVIEW_CACHE[url] = {"ts": time.time(), "meta": meta}
+        _PREVIEW_CACHE_DIRTY = True
+    return meta
+
+
+def _fetch_preview(url: str) -> Dict[str, str]:
     try:
-        resp = requests.get(url, headers=HTTP_HEADERS, timeout=10)
-        resp.raise_for_status()
-        resp.encoding = resp.apparent_encoding or resp.encoding or "utf-8"
-        html = resp.text
+        # OG tags live in <head>, so stream the body and stop after ~64 KB
+        # or as soon as </head> shows up instead of downloading full pages.
+        with _SESSION.get(url, headers=HTTP_HEADERS, timeout=10, stream=True) as resp:
+            resp.raise_for_status()
+            chunks: List[bytes] = []
+            total = 0
+            for chunk in resp.iter_content(8192):
+                chunks.append(chunk)
+                total += len(chunk)
+                if total >= _PREVIEW_BYTE_BUDGET or b"</head>" in chunk:
+                    break
+            raw = b"".join(chunks)
+            encoding = resp.encoding
+
+        if lxml_html is not None:
+            # Hand the raw bytes to lxml; it reads the declared charset
+            # without the chardet pass apparent_encoding would run.
+            html: "str | bytes" = raw
+        else:
+            if not encoding:
+                # No charset in Content-Type. Our known sources serve
+                # UTF-8; a chardet pass over a truncated body would be
+                # unreliable anyway, so default to UTF-8 elsewhere too.
+                encoding = "utf-8"
+            html = raw.decode(encoding, errors="replace")
     except Exception:
         return {"title": "", "description": ""}
 
-    og_title = _extract_meta(
-        html, r'<meta[^>]+property=["\']og:title["\'][^>]+content=["\'](.*?)["\']'
-    )
-    og_desc = _extract_meta(
-        html, r'<meta[^>]+property=["\']og:description["\'][^>]+content=["\'](.*?)["\']'
-    )
-    og_image = _extract_meta(
-        html, r'<meta[^>]+property=["\']og:image["\'][^>]+content=["\'](.*?)["\']'
-    )
-    title_tag = _extract_meta(html, r"<title[^>]*>(.*?)</title>")
-
-    title = og_title or title_tag
-    description = og_desc
-    return {"title": title, "description": description, "image": og_image}
+    meta = _parse_og_meta(html)
+    title = meta["og_title"] or meta["title_tag"]
+    description = meta["og_desc"]
+    return {"title": title, "description": description, "image": meta["og_image"]}
 
 
-def _source_label(url: str) -> str:
-    if "note.com" in url:
+@lru_cache(maxsize=256)
+def _source_label(host: str) -> str:
+    if "note.com" in host:
         return "note（ノート）"
-    if "prtimes.jp" in url:
+    if "prtimes.jp" in host:
         return "PR TIMES"
     return "update"
 
 
-def _source_icon(url: str) -> str:
-    if "note.com" in url:
-        return "https://play-lh.googleusercontent.com/Jcdw4nXOdeg3pMPJldirClrj__oBd-UVZPehnb9Zn5MtWvWCQivgLqJ1mux0JjyxvA"
-    if "prtimes.jp" in url:
-        return "https://encrypted-tbn0.gstatic.com/images?q=tbn:ANd9GcTj6jiPk40UN8Vih6Vtaqv0DiIIF3ZUXWms1g&s"
-    return ""
-
+def build_preview_blocks(
+    url: str,
+    *,
+    name: Optional[str] = None,
+    title: Optional[str] = None,
+    description: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    Build the manual-preview blocks and fallback text for a URL.
 
-def send_with_preview(url: str, *, name: Optional[str] = None) -> requests.Response:
-    """Send a Slack message with manual preview via blocks."""
-    meta = fetch_preview(url)
+    When the caller already knows the title (e.g., from the sitemap or RSS
+    item), the OG preview fetch is skipped entirely.
+    """
+    if title:
+        meta = {"title": title, "description": description or "", "image": ""}
+    else:
+        meta = fetch_preview(url)
     title = meta.get("title") or url
     description = meta.get("description") or ""
     image = meta.get("image") or ""
@@ -159,12 +348,9 @@ def send_with_preview(url: str, *, name: Optional[str] = None) -> requests.Respo
     if len(description) > 500:
         description = description[:500] + "…"
 
-    label = _source_label(url)
-    quoted_lines = []
+    label = _source_label(urlsplit(url).netloc)
     label_text = f"{label} - {name}" if name else label
-    quoted_lines.append(f"> {label_text}")
-    quoted_lines.append(f"> {url}")
-    quoted_lines.append(f"> *{title}*")
+    quoted_lines = [f"> {label_text}", f"> {url}", f"> *{title}*"]
     if description:
         quoted_lines.append(f"> {description}")
 
@@ -181,6 +367,20 @@ def send_with_preview(url: str, *, name: Optional[str] = None) -> requests.Respo
     ]
 
     fallback_text = f"{name} | {label}: {title}" if name else f"{label}: {title}"
+    return blocks, fallback_text
+
+
+def send_with_preview(
+    url: str,
+    *,
+    name: Optional[str] = None,
+    title: Optional[str] = None,
+    description: Optional[str] = None,
+) -> requests.Response:
+    """Send a Slack message with manual preview via blocks."""
+    blocks, fallback_text = build_preview_blocks(
+        url, name=name, title=title, description=description
+    )
     return send_to_slack(fallback_text, enable_unfurl=False, blocks=blocks)
 
 
@@ -189,31 +389,72 @@ def run_notification(window_hours: int = 1, *, persist_cache: bool = True) -> di
     Execute release/note checks and post results to Slack.
     Returns a summary dict for logging/HTTP responses.
     """
+    # Deferred imports: the checkers (and their XML/session setup) are only
+    # needed here, so importing the handler module stays cheap on cold start.
+    import api.a1_check_releace as pr_checker
+    import api.a2_check_note as note_checker
+    from spreadsheet2json import load_spreadsheet_data
+
     sheet_data = load_spreadsheet_data(force_refresh=True, persist=persist_cache)
     name_index = _build_name_index(sheet_data)
 
-    pr_data = pr_checker.check_releases(window_hours=window_hours)
+    # Pass the sheet through so the checkers don't re-fetch the CSV.
+    pr_data = pr_checker.check_releases(window_hours=window_hours, sheet_data=sheet_data)
     pr_checker.write_output(pr_data)
 
-    note_data = note_checker.check_notes(window_hours=window_hours)
+    note_data = note_checker.check_notes(window_hours=window_hours, sheet_data=sheet_data)
     note_checker.write_output(note_data)
 
+    # Carry the title the checkers already extracted so the preview builder
+    # can skip its OG fetch for these URLs.
+    pr_map = name_index["pr"]
+    note_map = name_index["note"]
     pr_entries = [
-        (r.get("url", ""), name_index["pr"].get(r.get("company_id", "")))
+        (r.get("url", ""), pr_map.get(r.get("company_id", "")), r.get("title", ""))
         for r in pr_data.get("releases", [])
         if r.get("url")
     ]
     note_entries = [
-        (a.get("url", ""), name_index["note"].get(a.get("note_id", "")))
+        (a.get("url", ""), note_map.get(a.get("note_id", "")), a.get("title", ""))
         for a in note_data.get("articles", [])
         if a.get("url")
     ]
 
-    responses = []
-    for url, name in pr_entries:
-        responses.append(send_with_preview(url, name=name))
-    for url, name in note_entries:
-        responses.append(send_with_preview(url, name=name))
+    all_entries = pr_entries + note_entries
+    responses: List[requests.Response] = []
+    if all_entries:
+        # Prefetch the OG previews concurrently (ex.map preserves entry
+        # order), then post everything as a single webhook message.
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            built = list(
+                executor.map(
+                    lambda entry: build_preview_blocks(entry[0], name=entry[1], title=entry[2]),
+                    all_entries,
+                )
+            )
+
+        # Slack caps a message at 50 blocks; shard into as few messages
+        # as fit under the limit (usually just one).
+        all_blocks: List[Dict[str, Any]] = []
+        fallback_parts: List[str] = []
+        for blocks, fallback_text in built:
+            needed = len(blocks) + (1 if all_blocks else 0)
+            if all_blocks and len(all_blocks) + needed > _SLACK_MAX_BLOCKS:
+                responses.append(
+                    send_to_slack(
+                        "\n".join(fallback_parts), enable_unfurl=False, blocks=all_blocks
+                    )
+                )
+                all_blocks = []
+                fallback_parts = []
+            if all_blocks:
+                all_blocks.append({"type": "divider"})
+            all_blocks.extend(blocks)
+            fallback_parts.append(fallback_text)
+
+        responses.append(
+            send_to_slack("\n".join(fallback_parts), enable_unfurl=False, blocks=all_blocks)
+        )
 
     # When nothing new, don't post anything.
 
@@ -249,10 +490,16 @@ def build_response() -> Dict[str, Any]:
         body = {"ok": False, "error": str(exc)}
         status_code = 500
 
+    # Body stays UTF-8 bytes end to end: orjson emits bytes natively, and
+    # _dispatch writes them to the socket without a str round-trip.
+    if orjson is not None:
+        body_bytes = orjson.dumps(body)
+    else:
+        body_bytes = json.dumps(body, ensure_ascii=False).encode("utf-8")
     return {
         "statusCode": status_code,
         "headers": {"Content-Type": "application/json"},
-        "body": json.dumps(body, ensure_ascii=False),
+        "body": body_bytes,
     }
 
 
@@ -266,15 +513,18 @@ class Handler(BaseHTTPRequestHandler):
         result = build_response()
         status = result.get("statusCode", 200)
         headers = result.get("headers", {}) or {}
-        body = result.get("body", "")
+        body = result.get("body", b"")
         if not isinstance(body, (str, bytes)):
             body = json.dumps(body, ensure_ascii=False)
+        payload = body if isinstance(body, bytes) else body.encode("utf-8")
 
         self.send_response(status)
         for k, v in headers.items():
             self.send_header(k, v)
+        # Explicit length lets the client reuse the connection without
+        # waiting for EOF or chunked framing.
+        self.send_header("Content-Length", str(len(payload)))
         self.end_headers()
-        payload = body if isinstance(body, bytes) else body.encode("utf-8")
         self.wfile.write(payload)
 
     def do_GET(self):
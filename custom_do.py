@@ -5,7 +5,7 @@ import sys
 import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
 
 import api.a1_check_releace as pr_checker
 import api.a2_check_note as note_checker
@@ -48,8 +48,9 @@ def _collect_pr_items(
     range_start_utc: datetime,
     range_end_utc: datetime,
     name_index: Dict[str, Dict[str, str]],
+    sheet_data: Optional[Dict[str, Any]] = None,
 ) -> List[Dict[str, str]]:
-    pr_ids = pr_checker.load_prtimes_ids()
+    pr_ids = pr_checker.load_prtimes_ids(sheet_data)
     target_set = set(pr_ids)
     releases = pr_checker.parse_sitemap(pr_checker.fetch_sitemap())
 
@@ -84,8 +85,9 @@ def _collect_note_items(
     range_start_utc: datetime,
     range_end_utc: datetime,
     name_index: Dict[str, Dict[str, str]],
+    sheet_data: Optional[Dict[str, Any]] = None,
 ) -> List[Dict[str, str]]:
-    note_ids = note_checker.load_note_ids()
+    note_ids = note_checker.load_note_ids(sheet_data)
     items: List[Dict[str, str]] = []
 
     for note_id in note_ids:
@@ -189,8 +191,8 @@ def main() -> None:
     sheet_data = load_spreadsheet_data(force_refresh=True, persist=True)
     name_index = _build_name_index(sheet_data)  # type: ignore[arg-type]
 
-    pr_items = _collect_pr_items(range_start_utc, range_end_utc, name_index)
-    note_items = _collect_note_items(range_start_utc, range_end_utc, name_index)
+    pr_items = _collect_pr_items(range_start_utc, range_end_utc, name_index, sheet_data)
+    note_items = _collect_note_items(range_start_utc, range_end_utc, name_index, sheet_data)
     items = _dedupe_and_sort(pr_items + note_items)
 
     print(f"Found {len(items)} items (pr={len(pr_items)}, note={len(note_items)}).")
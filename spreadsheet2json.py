@@ -10,11 +10,13 @@ from __future__ import annotations
 
 import csv
 import json
+import time
 from pathlib import Path
 from typing import Iterable, List, Mapping
 from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter, Retry
 
 
 SHEET_ID = "16zcRbmvBEdkWDARh-OZ_r8b-ucnKoFKQNLp9nF3EV4k"
@@ -24,23 +26,35 @@ CSV_URL = (
 )
 OUTPUT_PATH = Path("spreadsheet2json.json")
 
+# Shared session so repeated CSV exports reuse TCP/TLS connections.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=2, backoff_factor=0.2),
+    ),
+)
+
 
 def _dedupe_preserve_order(values: Iterable[str]) -> List[str]:
-    seen = set()
-    unique = []
-    for value in values:
-        if value not in seen:
-            seen.add(value)
-            unique.append(value)
-    return unique
+    # dict.fromkeys dedupes in C while preserving insertion order.
+    return list(dict.fromkeys(values))
+
+
+_MISSING_EXACT = frozenset(("なし", "ナシ", "無し"))
+_MISSING_PREFIX = ("なし", "ナシ", "無し")
 
 
 def _is_missing(value: str) -> bool:
+    if not value:
+        return True
     normalized = value.replace("　", "").strip()
-    return bool(
+    return (
         not normalized
-        or normalized in {"なし", "ナシ", "無し"}
-        or normalized.startswith(("なし", "ナシ", "無し"))
+        or normalized in _MISSING_EXACT
+        or normalized.startswith(_MISSING_PREFIX)
     )
 
 
@@ -50,6 +64,12 @@ def _normalize_note_id(value: str) -> str:
     if not raw:
         return ""
 
+    # Bare usernames (the common case) skip the urlparse machinery entirely;
+    # anything mentioning note.com takes the URL path so a bare domain still
+    # normalizes to "" and gets skipped.
+    if "/" not in raw and ":" not in raw and "note.com" not in raw:
+        return raw.lstrip("@")
+
     # Accept URLs such as https://note.com/username or note.com/@username
     if "note.com" in raw or "://" in raw:
         parsed = urlparse(raw if "://" in raw else f"https://{raw}")
@@ -63,19 +83,30 @@ def _normalize_note_id(value: str) -> str:
 
 
 def fetch_sheet_csv() -> str:
-    resp = requests.get(CSV_URL, timeout=30)
+    resp = _SESSION.get(CSV_URL, timeout=30)
     resp.raise_for_status()
     resp.encoding = "utf-8"
     return resp.text
 
 
+def fetch_and_parse() -> dict:
+    """Stream the sheet CSV straight into the parser without buffering text."""
+    with _SESSION.get(CSV_URL, timeout=30, stream=True) as resp:
+        resp.raise_for_status()
+        resp.encoding = "utf-8"
+        return _parse_rows(csv.DictReader(resp.iter_lines(decode_unicode=True)))
+
+
 def parse_ids(csv_text: str) -> dict:
+    return _parse_rows(csv.DictReader(csv_text.splitlines()))
+
+
+def _parse_rows(reader: "csv.DictReader") -> dict:
     prtimes_ids = []
     note_ids = []
     x_ids = []
     people = {}
 
-    reader = csv.DictReader(csv_text.splitlines())
     for row in reader:
         name = (row.get("氏名") or "").strip()
         prtimes_value = (row.get("prtimes_id") or "").strip()
@@ -116,31 +147,43 @@ def write_json(data: dict) -> None:
         pass
 
 
+# In-process cache of the last *fetched* sheet. Warm serverless invocations
+# within the TTL skip the CSV round-trip entirely; the on-disk JSON (which
+# may be arbitrarily stale) never feeds this cache.
+_CACHE: dict = {"data": None, "ts": 0.0}
+_CACHE_TTL_SECONDS = 300.0
+
+
 def load_spreadsheet_data(
     force_refresh: bool = False, *, persist: bool = True
 ) -> Mapping[str, List[str]]:
     """
     Return parsed sheet data, optionally re-fetching the latest CSV.
 
+    A freshly fetched result is kept in memory for a short TTL, so repeated
+    calls (including force_refresh callers) within the window are free.
     Falls back to re-fetching if the on-disk JSON is missing or invalid.
     When persist=False (e.g., API on read-only FS), skip writing the JSON cache.
     """
+    if _CACHE["data"] is not None and time.monotonic() - _CACHE["ts"] < _CACHE_TTL_SECONDS:
+        return _CACHE["data"]
+
     if not force_refresh and OUTPUT_PATH.exists():
         try:
             return json.loads(OUTPUT_PATH.read_text(encoding="utf-8"))
         except Exception:
             pass
 
-    csv_text = fetch_sheet_csv()
-    data = parse_ids(csv_text)
+    data = fetch_and_parse()
+    _CACHE["data"] = data
+    _CACHE["ts"] = time.monotonic()
     if persist:
         write_json(data)
     return data
 
 
 def main() -> None:
-    csv_text = fetch_sheet_csv()
-    data = parse_ids(csv_text)
+    data = fetch_and_parse()
     write_json(data)
 
 